@@ -34,77 +34,62 @@ def parse_platform(platform: str) -> tuple[str, str]:
 def load_manifest(path: Path) -> dict[str, Any]:
     """Load the JSON manifest from the provided file path."""
     try:
-        content = path.read_text(encoding="utf-8")
+        with path.open("rb") as fp:
+            return json.load(fp)
     except FileNotFoundError as exc:
         raise ValueError(f"Manifest JSON not found: {path}") from exc
-    try:
-        return json.loads(content)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Manifest JSON is invalid: {path}") from exc
 
 
-def extract_platforms(data: dict[str, Any]) -> list[dict[str, Any]]:
-    platforms: list[dict[str, Any]] = []
+def platform_key(entry: Any) -> tuple[str, str] | None:
+    """Return the (os, architecture) pair of a platform entry, if well formed."""
+    if not isinstance(entry, dict):
+        return None
+    os_name = entry.get("os")
+    arch = entry.get("architecture")
+    if not isinstance(os_name, str) or not isinstance(arch, str):
+        return None
+    return os_name, arch
+
+
+def extract_platforms(data: dict[str, Any]) -> frozenset[tuple[str, str]]:
+    """Collect the (os, architecture) pairs advertised by an inspect result."""
+    platforms: set[tuple[str, str]] = set()
 
     manifest = data.get("manifest") or data.get("Manifest")
     if isinstance(manifest, dict):
         manifests = manifest.get("manifests")
         if isinstance(manifests, list):
-            for m in manifests:
-                if not isinstance(m, dict):
-                    continue
-                p = m.get("platform")
-                if not isinstance(p, dict):
-                    continue
-                ann = m.get("annotations")
-                if (
-                    isinstance(ann, dict)
-                    and ann.get("vnd.docker.reference.type") == "attestation-manifest"
-                ):
-                    continue
-                # skip unknown/unknown entries defensively
-                if p.get("os") == "unknown" and p.get("architecture") == "unknown":
-                    continue
-                platforms.append(p)
+            entries = (m.get("platform") for m in manifests if isinstance(m, dict))
+            # buildx attestation manifests are reported as unknown/unknown
+            platforms.update(
+                key
+                for key in map(platform_key, entries)
+                if key is not None and key != ("unknown", "unknown")
+            )
 
         # Some index formats may include manifest.platform, but many single-arch manifests do not.
-        p = manifest.get("platform")
-        if isinstance(p, dict):
-            platforms.append(p)
+        key = platform_key(manifest.get("platform"))
+        if key is not None:
+            platforms.add(key)
 
-    # NEW: fallback to image config for single-arch images
+    # Fallback to image config for single-arch images
     image = data.get("image") or data.get("Image")
     if isinstance(image, dict):
         # single-platform: {"os":"linux","architecture":"amd64",...}
-        if isinstance(image.get("os"), str) and isinstance(
-            image.get("architecture"), str
-        ):
-            platforms.append({"os": image["os"], "architecture": image["architecture"]})
+        key = platform_key(image)
+        if key is not None:
+            platforms.add(key)
         else:
             # multi-platform: {"linux/amd64": {...}, "linux/arm64": {...}}
-            for v in image.values():
-                if (
-                    isinstance(v, dict)
-                    and isinstance(v.get("os"), str)
-                    and isinstance(v.get("architecture"), str)
-                ):
-                    platforms.append({"os": v["os"], "architecture": v["architecture"]})
+            platforms.update(filter(None, map(platform_key, image.values())))
 
     # Existing fallback
     if not platforms and isinstance(data.get("platforms"), list):
-        platforms = [p for p in data["platforms"] if isinstance(p, dict)]
+        platforms.update(filter(None, map(platform_key, data["platforms"])))
 
-    return platforms
-
-
-def is_platform_supported(
-    platforms: list[dict[str, Any]], os_name: str, arch: str
-) -> bool:
-    """Return True when any manifest entry matches the requested platform."""
-    return any(
-        entry.get("os") == os_name and entry.get("architecture") == arch
-        for entry in platforms
-    )
+    return frozenset(platforms)
 
 
 def parse_args() -> argparse.Namespace:
@@ -134,8 +119,7 @@ def main() -> int:
     args = parse_args()
     os_name, arch = parse_platform(args.platform)
     manifest = load_manifest(args.inspect_json)
-    platforms = extract_platforms(manifest)
-    supported = is_platform_supported(platforms, os_name, arch)
+    supported = (os_name, arch) in extract_platforms(manifest)
     print("true" if supported else "false")
     return 0
 
@@ -9,192 +9,910 @@ extension suffix (e.g., "6.0.1-ext-v3.3").
 """
 
 import argparse
+import asyncio
+import base64
+import functools
+import http.client
 import json
+import math
 import os
 import re
-import subprocess
 import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from itertools import chain
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.parse import quote, unquote, urljoin, urlsplit, urlunsplit
+from urllib.request import Request, getproxies, proxy_bypass
+from urllib.response import addinfourl
 
 VERSION_PATTERN_TEXT = (
     r"(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)"
     r"(?:-ext-v(?P<ext_major>\d+)(?:\.(?P<ext_minor>\d+))?)?"
 )
-VERSION_PATTERN = re.compile(rf"^{VERSION_PATTERN_TEXT}$")
+# Always applied with fullmatch(): "$" would also accept a trailing newline.
+VERSION_PATTERN = re.compile(VERSION_PATTERN_TEXT)
+
+# Tag variant prefix -> upstream Docker Hub image mirrored under that prefix.
+VARIANTS = {
+    "official": "sharelatex/sharelatex",
+    "full": "tuetenk0pp/sharelatex-full",
+    "cep": "overleafcep/sharelatex",
+}
+
+# Number of versions just before the first missing tag that are re-checked to
+# catch gaps, and the maximum number of GHCR probes issued concurrently.
+GAP_CHECK_WINDOW = 5
+PROBE_WORKERS = 16
+# Versions probed per search round. The probing search is the fallback for a
+# failed (often throttled) tag listing, so each round stays narrow enough that
+# the total request count stays close to a plain binary search.
+PROBE_ROUND_WIDTH = 2
+# Single probes walked back from the newest version, with doubling strides,
+# before falling back to the concurrent search over the remaining range.
+GALLOP_STEPS = 3
+
+# Docker Hub caps page_size at 100; the remaining pages are fetched
+# concurrently once the first page reports the total tag count.
+DOCKERHUB_PAGE_SIZE = 100
+PAGE_FETCH_WORKERS = 8
+# A few concurrent buildx copies scale well before the runner's network
+# saturates.
+MIRROR_WORKERS = 4
+
+# Manifest media types accepted when talking to the registry API directly, so
+# that both OCI and Docker (multi-arch or single-arch) manifests resolve.
+MANIFEST_MEDIA_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+)
+MANIFEST_ACCEPT = ", ".join(MANIFEST_MEDIA_TYPES)
+
+# Legacy manifest formats that modern Docker toolchains can no longer copy.
+SCHEMA1_MEDIA_TYPES = frozenset(
+    {
+        "application/vnd.docker.distribution.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v1+prettyjws",
+    }
+)
+
+LINK_NEXT_PATTERN = re.compile(r'<(?P<url>[^>]+)>;\s*rel="next"')
+
+# Complete GHCR tag sets already listed in this process, keyed by image. The
+# lock makes concurrent callers wait for a single listing instead of each
+# issuing their own.
+GHCR_TAG_SETS: dict[str, set[str]] = {}
+GHCR_TAG_SETS_LOCK = threading.Lock()
+
+# Idle keep-alive connections shared by every HTTP request in the process,
+# keyed by (scheme, host), so TLS handshakes are paid once per connection
+# rather than once per request.
+HTTP_POOL: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+HTTP_POOL_LOCK = threading.Lock()
+HTTP_POOL_MAXSIZE = PROBE_WORKERS
+# Errors raised when the server closed an idle pooled connection.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+# Throttling and gateway errors are retried a couple of times with a short,
+# capped wait, so a probe thread is never held for long.
+HTTP_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+HTTP_RETRIES = 2
+HTTP_RETRY_DELAY = 1.0
+HTTP_MAX_RETRY_DELAY = 5.0
+
+
+@functools.lru_cache(maxsize=8)
+def variant_version_pattern(variant: str) -> re.Pattern[str]:
+    """Compile a pattern for "<variant>-<version>" tags capturing the version."""
+    return re.compile(rf"{re.escape(variant)}-(?P<version>{VERSION_PATTERN_TEXT})")
 
 
-def parse_version_parts(version: str) -> tuple[int, int, int, int | None, int | None]:
+@functools.lru_cache(maxsize=4096)
+def parse_version_parts(version: str) -> tuple[int, int, int, int, int]:
     """Parse a version string into numeric components, including CEP extension versions.
 
+    The result doubles as the version's sort key (see version_sort_key).
+
     Args:
         version: Version string such as "6.0.0" or "6.0.0-ext-v3.3".
 
     Returns:
-        Tuple of (major, minor, patch, ext_major, ext_minor). Extension values
-        are None when the version does not include the CEP suffix.
+        Tuple of (major, minor, patch, ext_major, ext_minor). Both extension
+        values are -1 when the version does not include the CEP suffix, so
+        plain semver tags sort before CEP extension variants with the same
+        base version; a missing extension minor is 0. Results are memoized,
+        since the same tags are parsed by every sort, max and cache write in
+        a run.
     """
-    match = VERSION_PATTERN.match(version)
-    if not match:
+    # A fixed-shape split is several times cheaper than a regex match and
+    # accepts exactly what VERSION_PATTERN does.
+    base, separator, extension = version.partition("-ext-v")
+    base_parts = base.split(".")
+    ext_parts = extension.split(".") if separator else []
+    if (
+        len(base_parts) != 3
+        or len(ext_parts) > 2
+        or not all(part.isdecimal() for part in chain(base_parts, ext_parts))
+    ):
         raise ValueError(f"Unsupported version format: {version}")
-    major = int(match.group("major"))
-    minor = int(match.group("minor"))
-    patch = int(match.group("patch"))
-    ext_major = match.group("ext_major")
-    ext_minor = match.group("ext_minor")
+    major, minor, patch = map(int, base_parts)
+    if not ext_parts:
+        return major, minor, patch, -1, -1
+    ext_minor = int(ext_parts[1]) if len(ext_parts) == 2 else 0
+    return major, minor, patch, int(ext_parts[0]), ext_minor
+
+
+# parse_version_parts already produces a sort-ready key for base and CEP
+# variant version strings, so sorting uses it directly instead of paying for
+# an extra function call per key.
+version_sort_key = parse_version_parts
+
+
+def sort_versions(versions: Iterable[str]) -> list[str]:
+    """Return versions in ascending order using version_sort_key.
+
+    sorted() evaluates the key once per element, so each version string is
+    parsed exactly once regardless of how many comparisons the sort makes.
+    """
+    return sorted(versions, key=version_sort_key)
+
+
+def get_proxy(scheme: str, netloc: str) -> tuple[str, dict[str, str]] | None:
+    """Look up the proxy for a host from HTTP(S)_PROXY and NO_PROXY, as urlopen does.
+
+    Returns:
+        Tuple of (proxy host[:port], headers to send to the proxy), or None
+        when the host is reached directly.
+    """
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(urlsplit(f"//{netloc}").hostname or netloc):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    headers = {}
+    if parts.username is not None:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = (
+            f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        )
+    return parts.netloc.rpartition("@")[2], headers
+
+
+def open_connection(
+    scheme: str, netloc: str, timeout: float
+) -> http.client.HTTPConnection:
+    """Open a new connection to a host, through the configured proxy if any.
+
+    HTTPS requests are tunnelled through the proxy with CONNECT.
+    """
+    proxy = get_proxy(scheme, netloc)
+    if proxy is None:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=timeout)
+        return http.client.HTTPConnection(netloc, timeout=timeout)
+    proxy_netloc, proxy_headers = proxy
+    if scheme == "https":
+        conn = http.client.HTTPSConnection(proxy_netloc, timeout=timeout)
+        conn.set_tunnel(netloc, headers=proxy_headers)
+        return conn
+    return http.client.HTTPConnection(proxy_netloc, timeout=timeout)
+
+
+def checkout_connection(
+    scheme: str, netloc: str, timeout: float
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Take an idle pooled connection to a host, or open a new one.
+
+    Returns:
+        Tuple of (connection, whether it was reused from the pool).
+    """
+    with HTTP_POOL_LOCK:
+        idle = HTTP_POOL.get((scheme, netloc))
+        conn = idle.pop() if idle else None
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    return open_connection(scheme, netloc, timeout), False
+
+
+def checkin_connection(
+    scheme: str, netloc: str, conn: http.client.HTTPConnection
+) -> None:
+    """Return a connection whose response was fully read to the pool."""
+    with HTTP_POOL_LOCK:
+        idle = HTTP_POOL.setdefault((scheme, netloc), [])
+        if len(idle) < HTTP_POOL_MAXSIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def exchange(
+    conn: http.client.HTTPConnection,
+    request: Request,
+    path: str,
+    headers: dict[str, str],
+) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send a request on a connection and read the whole response."""
+    conn.request(request.get_method(), path, body=request.data, headers=headers)
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def http_open(request: Request | str, timeout: float = 30) -> addinfourl:
+    """Perform an HTTP request over a pooled keep-alive connection.
+
+    Stands in for urlopen() as used by this script: the response is fully
+    read and returned as a file-like object, HTTP error statuses raise
+    HTTPError, connection failures raise URLError, and proxies from
+    HTTP_PROXY/HTTPS_PROXY/NO_PROXY are honoured. Redirects are not followed.
+    Connections are reused across calls and threads. 429 and 502-504
+    responses are retried up to HTTP_RETRIES times, waiting at most
+    HTTP_MAX_RETRY_DELAY seconds each time.
+    """
+    if isinstance(request, str):
+        request = Request(request)
+    parts = urlsplit(request.full_url)
+    path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    headers = dict(request.header_items())
+    # Plain HTTP goes to the proxy itself, addressed by absolute URL.
+    proxy = get_proxy(parts.scheme, parts.netloc) if parts.scheme == "http" else None
+    if proxy is not None:
+        path = urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+        headers.update(proxy[1])
+
+    attempt = 0
+    while True:
+        conn, reused = checkout_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            try:
+                response, data = exchange(conn, request, path, headers)
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # The server closed the connection while it sat in the pool;
+                # resend once on a fresh connection. Timeouts are not retried.
+                conn.close()
+                conn = open_connection(parts.scheme, parts.netloc, timeout)
+                response, data = exchange(conn, request, path, headers)
+        except (http.client.HTTPException, OSError) as exc:
+            conn.close()
+            raise URLError(exc) from exc
+
+        if response.will_close:
+            conn.close()
+        else:
+            checkin_connection(parts.scheme, parts.netloc, conn)
+
+        status = response.status
+        if status in HTTP_RETRY_STATUSES and attempt < HTTP_RETRIES:
+            retry_after = response.getheader("Retry-After", "")
+            delay = (
+                int(retry_after)
+                if retry_after.isdigit()
+                else HTTP_RETRY_DELAY * 2**attempt
+            )
+            time.sleep(min(delay, HTTP_MAX_RETRY_DELAY))
+            attempt += 1
+            continue
+        if status >= 400:
+            raise HTTPError(
+                request.full_url, status, response.reason, response.msg, BytesIO(data)
+            )
+        return addinfourl(BytesIO(data), response.msg, request.full_url, status)
+
+
+def fetch_dockerhub_json(url: str) -> dict | None:
+    """Fetch a Docker Hub API URL and decode its JSON body.
+
+    Returns:
+        Decoded JSON response, or None when the request failed.
+    """
+    try:
+        with http_open(url, timeout=30) as response:
+            return json.loads(response.read())
+    except (URLError, HTTPError, json.JSONDecodeError):
+        return None
+
+
+def dockerhub_tags_page_url(image: str, page: int) -> str:
+    """Build the URL of one page of the Docker Hub tag listing, newest first."""
     return (
-        major,
-        minor,
-        patch,
-        int(ext_major) if ext_major is not None else None,
-        int(ext_minor) if ext_minor is not None else None,
+        f"https://hub.docker.com/v2/repositories/{image}/tags"
+        f"?page={page}&page_size={DOCKERHUB_PAGE_SIZE}&ordering=last_updated"
     )
 
 
-def version_sort_key(version: str) -> tuple[int, int, int, int, int]:
-    """Build a stable sort key for base and CEP variant version strings.
+def fetch_dockerhub_tags_page(url: str) -> dict | None:
+    """Fetch one page of the Docker Hub tag listing.
 
-    Missing extension values are represented with -1 so that plain semver tags
-    sort before CEP extension variants with the same base version.
+    Each tag entry carries a couple of dozen fields (images, digests, last
+    pusher, ...) of which only the name is needed, so the decoded page is
+    reduced right away and the full response is never kept around.
+
+    Returns:
+        Dict with the total tag "count", the "next" page URL (or None) and
+        the "versions" tags found on the page, or None when the request
+        failed.
     """
-    major, minor, patch, ext_major, ext_minor = parse_version_parts(version)
-    if ext_major is None:
-        return (major, minor, patch, -1, -1)
-    return (major, minor, patch, ext_major, 0 if ext_minor is None else ext_minor)
+    data = fetch_dockerhub_json(url)
+    if data is None:
+        return None
+    versions: list[str] = []
+    for tag_info in data.get("results", []):
+        tag = tag_info.get("name", "")
+        if VERSION_PATTERN.fullmatch(tag):
+            versions.append(tag)
+    return {"count": data.get("count"), "next": data.get("next"), "versions": versions}
+
 
+def get_dockerhub_manifest_media_type(image: str, reference: str) -> str | None:
+    """Look up the manifest media type of a Docker Hub image tag.
 
-def get_dockerhub_tags(image: str) -> list[str]:
+    Uses an anonymous pull token and a registry HEAD request, which does not
+    count against Docker Hub pull rate limits.
+
+    Returns:
+        Manifest media type, or None when it could not be determined.
+    """
+    scope = quote(f"repository:{image}:pull", safe="")
+    try:
+        with http_open(
+            f"https://auth.docker.io/token?service=registry.docker.io&scope={scope}",
+            timeout=30,
+        ) as response:
+            token = json.loads(response.read()).get("token", "")
+        req = Request(
+            f"https://registry-1.docker.io/v2/{image}/manifests/{reference}",
+            method="HEAD",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": ", ".join((*MANIFEST_MEDIA_TYPES, *SCHEMA1_MEDIA_TYPES)),
+            },
+        )
+        with http_open(req, timeout=30) as response:
+            return response.headers.get("Content-Type")
+    except (URLError, HTTPError, json.JSONDecodeError):
+        return None
+
+
+def get_dockerhub_tags(
+    image: str, stop_below: str | None = None, prefetch_pages: int = 1
+) -> list[str]:
     """Fetch version tags from Docker Hub for a given image.
 
     Args:
         image: Docker Hub image name (e.g., 'sharelatex/sharelatex')
+        stop_below: Optional watermark version, usually the newest version
+            already mirrored. Pages are then walked newest first by following
+            the "next" cursor, and pagination stops after the first page whose
+            versions are all at or below the watermark. Older versions missing
+            from the mirror are not discovered in this mode.
+        prefetch_pages: With ``stop_below``, the number of pages fetched
+            concurrently per round. Page 1 reports the total tag count, so
+            later pages can be requested by number ahead of the cursor; pages
+            past the watermark page are discarded. 1 walks the cursor
+            sequentially and never fetches pages beyond the watermark.
 
     Returns:
         List of version tags sorted by version number. Tags may include
         CEP-style suffixes such as "-ext-v3.3".
     """
-    page = 1
-    all_tags: list[str] = []
+    first_page = fetch_dockerhub_tags_page(dockerhub_tags_page_url(image, 1))
+    if first_page is None:
+        return []
 
-    while True:
-        url = f"https://hub.docker.com/v2/repositories/{image}/tags?page={page}&page_size=100"
-        try:
-            with urlopen(url, timeout=30) as response:
-                data = json.loads(response.read().decode())
-        except (URLError, HTTPError, json.JSONDecodeError):
-            break
+    def fetch_page(page: int) -> dict | None:
+        return fetch_dockerhub_tags_page(dockerhub_tags_page_url(image, page))
 
-        results = data.get("results", [])
-        if not results:
-            break
+    pages: list[dict | None] = [first_page]
+    page_count = math.ceil((first_page.get("count") or 0) / DOCKERHUB_PAGE_SIZE)
+    if stop_below is not None:
+        watermark = version_sort_key(stop_below)
+
+        def is_last_page(data: dict | None) -> bool:
+            if data is None or not data.get("next"):
+                return True
+            page_versions = data["versions"]
+            return bool(page_versions) and all(
+                version_sort_key(version) <= watermark for version in page_versions
+            )
+
+        if prefetch_pages > 1:
+            done = is_last_page(first_page)
+            with ThreadPoolExecutor(max_workers=prefetch_pages) as executor:
+                for start in range(2, page_count + 1, prefetch_pages):
+                    if done:
+                        break
+                    window = range(start, min(start + prefetch_pages, page_count + 1))
+                    for data in executor.map(fetch_page, window):
+                        pages.append(data)
+                        if is_last_page(data):
+                            done = True
+                            break
+        else:
+            data: dict | None = first_page
+            while not is_last_page(data):
+                data = fetch_dockerhub_tags_page(data["next"])
+                pages.append(data)
+    elif first_page.get("next") is not None and page_count > 1:
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+            pages.extend(executor.map(fetch_page, range(2, page_count + 1)))
 
-        for tag_info in results:
-            tag = tag_info.get("name", "")
-            if VERSION_PATTERN.match(tag):
-                all_tags.append(tag)
+    # Tags can repeat across pages when tags are pushed mid-pagination; a dict
+    # drops duplicates as they are collected, without a separate set pass.
+    all_tags: dict[str, None] = {}
+    for data in pages:
+        if data is not None:
+            all_tags.update(dict.fromkeys(data["versions"]))
 
-        if data.get("next") is None:
-            break
+    return sort_versions(all_tags)
 
-        page += 1
 
-    return sorted(set(all_tags), key=version_sort_key)
+def get_ghcr_registry_token(image: str, token: str, actions: str = "pull") -> str:
+    """Exchange a GitHub token for a GHCR registry bearer token.
 
+    Args:
+        image: GHCR image name (e.g., 'btreemap/overleaf')
+        token: GitHub token; when empty an anonymous pull token is requested
+        actions: Comma-separated registry actions to request (e.g., 'pull,push')
 
-def check_ghcr_tag_exists(image: str, tag: str) -> bool:
-    """Check if a tag exists in GHCR using Docker Buildx."""
-    result = subprocess.run(
-        ["docker", "buildx", "imagetools", "inspect", f"ghcr.io/{image}:{tag}"],
-        capture_output=True,
-        timeout=60,
+    Returns:
+        Registry bearer token, or the GitHub token unchanged if the exchange
+        failed.
+    """
+    scope = quote(f"repository:{image}:{actions}", safe="")
+    headers = {}
+    if token:
+        credentials = base64.b64encode(f"github-actions:{token}".encode()).decode()
+        headers["Authorization"] = f"Basic {credentials}"
+    req = Request(
+        f"https://ghcr.io/token?service=ghcr.io&scope={scope}", headers=headers
     )
-    return result.returncode == 0
+    try:
+        with http_open(req, timeout=30) as response:
+            data = json.loads(response.read())
+    except (URLError, HTTPError, json.JSONDecodeError):
+        return token
+    return data.get("token") or token
+
+
+def fetch_ghcr_tag_set(image: str, token: str) -> set[str] | None:
+    """Fetch every tag of a GHCR image using the registry tags/list API.
+
+    Follows the ``Link: <...>; rel="next"`` pagination headers so that the
+    full tag set is returned in as few requests as possible. Successful
+    listings are remembered in GHCR_TAG_SETS, so later lookups for the same
+    image in this process cost no requests until forget_ghcr_tags() is called
+    after a push; the returned set is shared and must not be modified.
+
+    Returns:
+        Set of tag names, or None when the tag list could not be retrieved.
+    """
+    with GHCR_TAG_SETS_LOCK:
+        cached = GHCR_TAG_SETS.get(image)
+        if cached is not None:
+            return cached
+
+        url: str | None = f"https://ghcr.io/v2/{image}/tags/list?n=1000"
+        tags: set[str] = set()
+
+        while url:
+            req = Request(url, headers={"Authorization": f"Bearer {token}"})
+            try:
+                with http_open(req, timeout=30) as response:
+                    data = json.loads(response.read())
+                    link = response.headers.get("Link", "")
+            except (URLError, HTTPError, json.JSONDecodeError):
+                return None
+
+            tags.update(data.get("tags") or [])
+
+            match = LINK_NEXT_PATTERN.search(link)
+            url = urljoin(url, match.group("url")) if match else None
+
+        GHCR_TAG_SETS[image] = tags
+        return tags
+
+
+@functools.lru_cache(maxsize=1024)
+def check_ghcr_tag_exists(image: str, tag: str, token: str = "") -> bool:
+    """Check if a tag exists in GHCR with a registry manifest HEAD request.
+
+    Answers are memoized until forget_ghcr_tags() is called after a push, so
+    repeated probes of the same tag cost nothing; errors are raised and
+    therefore not cached.
+
+    Returns:
+        True if the manifest exists, False if the registry reports 404.
+
+    Raises:
+        HTTPError: For any other error status (e.g., auth or rate limiting),
+            so that a failing registry is not mistaken for missing tags.
+        URLError: When the registry cannot be reached.
+    """
+    req = Request(
+        f"https://ghcr.io/v2/{image}/manifests/{tag}",
+        method="HEAD",
+        headers={"Authorization": f"Bearer {token}", "Accept": MANIFEST_ACCEPT},
+    )
+    try:
+        with http_open(req, timeout=60):
+            return True
+    except HTTPError as exc:
+        if exc.code == 404:
+            return False
+        raise
+
+
+def forget_ghcr_tags(image: str) -> None:
+    """Drop remembered tag listings and existence answers after a push.
+
+    Args:
+        image: GHCR image name, with or without the 'ghcr.io/' prefix
+    """
+    with GHCR_TAG_SETS_LOCK:
+        GHCR_TAG_SETS.pop(image.removeprefix("ghcr.io/"), None)
+    check_ghcr_tag_exists.cache_clear()
+
+
+def get_ghcr_manifest(image: str, reference: str, token: str) -> tuple[bytes, str]:
+    """Fetch a manifest from GHCR.
+
+    Returns:
+        Tuple of (raw manifest bytes, manifest media type).
+    """
+    req = Request(
+        f"https://ghcr.io/v2/{image}/manifests/{reference}",
+        headers={"Authorization": f"Bearer {token}", "Accept": MANIFEST_ACCEPT},
+    )
+    with http_open(req, timeout=30) as response:
+        return response.read(), response.headers.get("Content-Type", "")
+
+
+def put_ghcr_manifest(
+    image: str, reference: str, manifest: bytes, media_type: str, token: str
+) -> None:
+    """Upload a manifest to GHCR under the given tag.
+
+    Re-uploading an existing manifest unchanged points the tag at the same
+    digest, which retags an image without copying any blobs.
+    """
+    req = Request(
+        f"https://ghcr.io/v2/{image}/manifests/{reference}",
+        data=manifest,
+        method="PUT",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": media_type},
+    )
+    try:
+        with http_open(req, timeout=30):
+            pass
+    finally:
+        forget_ghcr_tags(image)
+
+
+def probe_tags_parallel(
+    image: str, tags: list[str], token: str = "", max_workers: int = PROBE_WORKERS
+) -> dict[str, bool]:
+    """Check several GHCR tags concurrently.
+
+    Returns:
+        Mapping of each tag to whether it exists.
+    """
+    if not tags:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tags))) as executor:
+        results = executor.map(
+            lambda tag: check_ghcr_tag_exists(image, tag, token), tags
+        )
+        return dict(zip(tags, results))
 
 
 def filter_versions_binary_search(
-    versions: list[str], variant: str, image: str, force_full_sync: bool = False
+    versions: list[str],
+    variant: str,
+    image: str,
+    force_full_sync: bool = False,
+    existing: set[str] | None = None,
+    token: str = "",
 ) -> list[str]:
     """Filter versions using binary search to find those needing mirroring.
 
-    This reduces API calls by probing for the first missing tag and then
-    checking a short window of earlier versions to handle gaps.
+    When the set of existing GHCR tags is known, every version without a
+    matching tag is returned, wherever the gaps are. Otherwise this reduces
+    API calls by searching for the first missing tag and then checking a short
+    window of earlier versions to handle gaps. Usually only the newest few
+    versions are missing, so the search first gallops back from the newest
+    version (offsets 1, 2, 4, ... up to GALLOP_STEPS probes), which settles
+    the common cases in one or two requests. Whatever range is left is then
+    searched by probing PROBE_ROUND_WIDTH evenly spaced versions concurrently
+    per round, about log_{PROBE_ROUND_WIDTH + 1}(N) round trips instead of
+    log_2(N), for a similar total number of requests.
+
+    ``versions`` must be sorted and free of duplicates, as returned by
+    get_dockerhub_tags; the result preserves that order.
     """
     if not versions:
         return []
 
+    assert len(set(versions)) == len(versions), "versions must be unique"
+
     if force_full_sync:
         return versions
 
-    count = len(versions)
-    left, right = 0, count - 1
-    first_missing = count
+    if existing is not None:
+        return [v for v in versions if f"{variant}-{v}" not in existing]
 
-    while left <= right:
-        mid = (left + right) // 2
-        tag = f"{variant}-{versions[mid]}"
+    tags = [f"{variant}-{version}" for version in versions]
+    probed: dict[str, bool] = {}
 
-        if check_ghcr_tag_exists(image, tag):
-            left = mid + 1
-        else:
-            first_missing = mid
-            right = mid - 1
+    # The first missing version lies in [left, right]: everything before
+    # left is assumed to exist and everything from right on is missing.
+    left, right = 0, len(versions)
+    # Gallop back from the newest version to bracket the first missing one.
+    index, stride = len(versions) - 1, 1
+    for _ in range(GALLOP_STEPS):
+        if index < 0:
+            break
+        probed[tags[index]] = check_ghcr_tag_exists(image, tags[index], token)
+        if probed[tags[index]]:
+            left = index + 1
+            break
+        right = index
+        index -= stride
+        stride *= 2
+    while left < right:
+        # Split [left, right) into PROBE_ROUND_WIDTH + 1 parts and probe the
+        # cut points, so each round needs one concurrent batch.
+        width = min(PROBE_ROUND_WIDTH, right - left)
+        indices = list(
+            dict.fromkeys(
+                left + (right - left) * part // (width + 1)
+                for part in range(1, width + 1)
+            )
+        )
+        unprobed = [tags[i] for i in indices if tags[i] not in probed]
+        probed.update(probe_tags_parallel(image, unprobed, token))
+        # Anchor on the newest existing probe so that older gaps fall into the
+        # gap window below, as with a plain binary search.
+        for i in reversed(indices):
+            if probed[tags[i]]:
+                left = i + 1
+                break
+        right = next((i for i in indices if i >= left), right)
+    first_missing = left
+
+    # Check the gap window in one concurrent batch, reusing earlier probes.
+    check_start = max(0, first_missing - GAP_CHECK_WINDOW)
+    unprobed = [tag for tag in tags[check_start:first_missing] if tag not in probed]
+    probed.update(probe_tags_parallel(image, unprobed, token))
+
+    result = [
+        versions[i] for i in range(check_start, first_missing) if not probed[tags[i]]
+    ]
+    result.extend(versions[first_missing:])
+
+    return result
+
+
+def read_tag_cache_file(path: str) -> dict:
+    """Read the raw cache file, which maps GHCR images to per-variant lists."""
+    try:
+        with open(path, "rb") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_tag_cache(path: str, image: str) -> dict[str, set[str]]:
+    """Load the per-variant set of versions already known to exist in GHCR.
+
+    Only entries recorded for ``image`` are returned. A missing or unreadable
+    cache file is treated as an empty cache, and entries that are not version
+    strings are dropped.
+    """
+    data = read_tag_cache_file(path).get(image)
+    if not isinstance(data, dict):
+        return {}
+    return {
+        variant: {
+            version
+            for version in versions
+            if isinstance(version, str) and VERSION_PATTERN.fullmatch(version)
+        }
+        for variant, versions in data.items()
+        if isinstance(versions, list)
+    }
+
+
+def save_tag_cache(path: str, image: str, cache: dict[str, set[str]]) -> None:
+    """Atomically write ``image``'s per-variant existence cache to disk.
 
-    seen: set[str] = set()
-    result: list[str] = []
+    Entries recorded for other images are kept unchanged.
+    """
+    payload = read_tag_cache_file(path)
+    payload[image] = {
+        variant: sort_versions(versions) for variant, versions in cache.items()
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, suffix=".tmp", delete=False
+    ) as f:
+        json.dump(payload, f)
+    os.replace(f.name, path)
+
+
+def discover_variant_versions(
+    variant: str,
+    source_image: str,
+    image: str,
+    force_full_sync: bool,
+    existing: set[str] | None,
+    token: str,
+    known: set[str] | None = None,
+    stop_below: str | None = None,
+    prefetch_pages: int = 1,
+) -> tuple[list[str], set[str]]:
+    """Discover versions to mirror for a single variant.
+
+    When the GHCR tag set ``existing`` is available it is authoritative: every
+    listed version is reported present and ``known`` is ignored, so a tag that
+    was deleted since an earlier run is mirrored again. Otherwise versions in
+    ``known`` were seen in GHCR by an earlier run and are not probed again,
+    since released tags are never removed. ``stop_below`` is
+    passed to get_dockerhub_tags to stop paginating once the already
+    mirrored versions are reached, fetching ``prefetch_pages`` pages at a
+    time.
 
-    for i in range(first_missing, count):
-        version = versions[i]
-        if version not in seen:
-            result.append(version)
-            seen.add(version)
+    Returns:
+        Tuple of (versions to mirror, versions known to exist).
+    """
+    print(f"Fetching tags from {source_image}...", file=sys.stderr)
+    all_versions = get_dockerhub_tags(source_image, stop_below, prefetch_pages)
 
-    check_start = max(0, first_missing - 5)
-    for i in range(check_start, first_missing):
-        version = versions[i]
-        tag = f"{variant}-{version}"
-        if version not in seen and not check_ghcr_tag_exists(image, tag):
-            result.append(version)
-            seen.add(version)
+    if force_full_sync or existing is not None or known is None:
+        known = set()
+    candidates = [version for version in all_versions if version not in known]
 
-    return sorted(result, key=version_sort_key)
+    filtered = filter_versions_binary_search(
+        candidates, variant, image, force_full_sync, existing, token
+    )
+    print(
+        f"{variant.capitalize()} versions to mirror: {len(filtered)}",
+        file=sys.stderr,
+    )
+    # The cache is rewritten from the GHCR tag list when it is available. The
+    # probing fallback only assumes that versions before its gap window exist,
+    # so nothing is added to the cache from it.
+    if existing is None:
+        return filtered, set(known)
+    pattern = variant_version_pattern(variant)
+    present = {
+        match.group("version") for match in map(pattern.fullmatch, existing) if match
+    }
+    return filtered, present
 
 
 def discover_versions(
     variant_filter: str = "all",
     force_full_sync: bool = False,
     image: str = "btreemap/overleaf",
+    token: str = "",
+    cache_file: str | None = None,
+    prefetch_pages: int = 1,
+    stop_at_mirrored: bool = False,
 ) -> dict[str, list[str]]:
-    """Discover versions to mirror for each variant."""
-    variants = {
-        "official": "sharelatex/sharelatex",
-        "full": "tuetenk0pp/sharelatex-full",
-        "cep": "overleafcep/sharelatex",
+    """Discover versions to mirror for each variant.
+
+    The GHCR tag list is fetched once and shared by all variants. If it cannot
+    be retrieved, existence is probed per tag instead. Variants are
+    independent, so they are discovered concurrently. When ``cache_file`` is
+    given, it records ``image``'s versions listed in GHCR, and the recorded
+    versions are skipped when the tag list cannot be fetched and tags are
+    probed instead.
+
+    With ``stop_at_mirrored`` and the tag list available, Docker Hub
+    pagination stops at each variant's newest mirrored version, fetching
+    ``prefetch_pages`` pages concurrently per round. This saves Docker Hub
+    requests, but older gaps in the mirror are not found, and a release can
+    be missed when more than a page of older tags was re-pushed after it.
+    It is therefore off by default, and every tag is listed.
+    """
+    # Pre-populate so the output keeps a stable variant order regardless of
+    # which discovery finishes first.
+    result: dict[str, list[str]] = {variant: [] for variant in VARIANTS}
+
+    selected = {
+        variant: source_image
+        for variant, source_image in VARIANTS.items()
+        if variant_filter in ("all", variant)
     }
+    if not selected:
+        return result
+
+    cache = load_tag_cache(cache_file, image) if cache_file else {}
+
+    if not force_full_sync:
+        token = get_ghcr_registry_token(image, token)
+    existing = None if force_full_sync else fetch_ghcr_tag_set(image, token)
+    if existing is None and not force_full_sync:
+        print("Could not list GHCR tags, probing tags individually", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+        futures = {
+            executor.submit(
+                discover_variant_versions,
+                variant,
+                source_image,
+                image,
+                force_full_sync,
+                existing,
+                token,
+                cache.get(variant),
+                (
+                    latest_variant_version(existing, variant)
+                    if stop_at_mirrored and existing is not None
+                    else None
+                ),
+                prefetch_pages,
+            ): variant
+            for variant, source_image in selected.items()
+        }
+        for future in as_completed(futures):
+            variant = futures[future]
+            filtered, present = future.result()
+            result[variant] = filtered
+            if not force_full_sync:
+                cache[variant] = present
+
+    if cache_file:
+        save_tag_cache(cache_file, image, cache)
 
-    result: dict[str, list[str]] = {}
+    return result
 
-    for variant, source_image in variants.items():
-        if variant_filter not in ("all", variant):
-            result[variant] = []
-            continue
 
-        print(f"Fetching tags from {source_image}...", file=sys.stderr)
-        all_versions = get_dockerhub_tags(source_image)
+async def run_imagetools_create(cmd: tuple[str, ...]) -> tuple[int, bytes]:
+    """Run a ``docker buildx imagetools create`` command without blocking.
 
-        filtered = filter_versions_binary_search(
-            all_versions, variant, image, force_full_sync
-        )
-        result[variant] = filtered
-        print(
-            f"{variant.capitalize()} versions to mirror: {len(filtered)}",
-            file=sys.stderr,
-        )
+    Only stderr is inspected, so stdout is discarded at the pipe level. It is
+    kept as bytes and only decoded when an error is reported.
 
-    return result
+    Returns:
+        Tuple of (exit status, raw stderr).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await proc.communicate()
+    return proc.returncode, stderr
 
 
-def mirror_image(
-    source: str, dest: str, version: str, variant: str, placeholder: str
+def floating_versions(version: str) -> tuple[str, str]:
+    """Return the major.minor and major floating tag versions of a version."""
+    major, minor, _, _, _ = parse_version_parts(version)
+    return f"{major}.{minor}", f"{major}"
+
+
+async def mirror_image_async(
+    source: str,
+    dest: str,
+    version: str,
+    variant: str,
+    placeholder: str,
+    floating: Iterable[str] | None = None,
 ) -> bool:
     """Mirror a Docker image with schema1 fallback to placeholder.
 
@@ -204,112 +922,202 @@ def mirror_image(
         version: Version to mirror (e.g., '5.0.1', '6.0.0-ext-v3.3')
         variant: Tag variant prefix (e.g., 'official', 'full', 'cep')
         placeholder: Placeholder image for schema1 manifests
+        floating: Floating tag versions to push alongside the exact tag
+            (e.g., ['6.0', '6']); defaults to the version's major.minor and
+            major.
 
     Returns:
         True if successful, False otherwise
     """
-    major, minor, _, _, _ = parse_version_parts(version)
-    major_minor = f"{major}.{minor}"
+    if floating is None:
+        floating = floating_versions(version)
 
     source_tag = f"docker.io/{source}:{version}"
     tags = [
         f"{dest}:{variant}-{version}",
-        f"{dest}:{variant}-{major_minor}",
-        f"{dest}:{variant}-{major}",
+        *(f"{dest}:{variant}-{alias}" for alias in floating),
     ]
 
     print(f"Mirroring {source_tag} to {dest}...")
 
-    # Build command with all tags
-    cmd = ["docker", "buildx", "imagetools", "create"]
-    for tag in tags:
-        cmd.extend(["-t", tag])
-    cmd.append(source_tag)
+    # Build the command prefix with all tags once; only the source differs
+    # between the initial attempt and the schema1 placeholder fallback.
+    base_cmd = (
+        "docker",
+        "buildx",
+        "imagetools",
+        "create",
+        *chain.from_iterable(("-t", tag) for tag in tags),
+    )
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Known schema1 sources go straight to the placeholder instead of first
+    # running a copy that is bound to fail. The lookup is blocking HTTP, so it
+    # runs in a worker thread to keep other mirrors going meanwhile.
+    media_type = await asyncio.to_thread(
+        get_dockerhub_manifest_media_type, source, version
+    )
+    if media_type not in SCHEMA1_MEDIA_TYPES:
+        returncode, stderr = await run_imagetools_create((*base_cmd, source_tag))
+        forget_ghcr_tags(dest)
+        if returncode == 0:
+            print(f"Successfully mirrored {variant}:{version}")
+            return True
 
-    if result.returncode != 0:
         # Check for schema1 manifest error
-        if "schema1" in result.stderr.lower() or "schema1" in result.stdout.lower():
-            print(f"Schema1 manifest detected for {version}, using placeholder image")
-
-            # Use placeholder image instead
-            cmd = ["docker", "buildx", "imagetools", "create"]
-            for tag in tags:
-                cmd.extend(["-t", tag])
-            cmd.append(placeholder)
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Error: {result.stderr}", file=sys.stderr)
-                return False
-            print(f"Successfully created placeholder for {variant}:{version}")
-            return True
-        else:
-            print(f"Error: {result.stderr}", file=sys.stderr)
+        if b"schema1" not in stderr.lower():
+            print(f"Error: {stderr.decode(errors='replace')}", file=sys.stderr)
             return False
 
-    print(f"Successfully mirrored {variant}:{version}")
+    print(f"Schema1 manifest detected for {version}, using placeholder image")
+
+    # Use placeholder image instead
+    returncode, stderr = await run_imagetools_create((*base_cmd, placeholder))
+    forget_ghcr_tags(dest)
+    if returncode != 0:
+        print(f"Error: {stderr.decode(errors='replace')}", file=sys.stderr)
+        return False
+    print(f"Successfully created placeholder for {variant}:{version}")
     return True
 
 
-def find_latest_ghcr_tag(image: str, variant: str, token: str) -> str | None:
-    """Find the latest version tag for a variant in GHCR."""
-    try:
-        req = Request(
-            f"https://ghcr.io/v2/{image}/tags/list",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        with urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode())
-            tags = data.get("tags", [])
-    except (URLError, HTTPError, json.JSONDecodeError):
-        return None
+def mirror_image(
+    source: str, dest: str, version: str, variant: str, placeholder: str
+) -> bool:
+    """Mirror a single Docker image; see mirror_image_async for details."""
+    return asyncio.run(mirror_image_async(source, dest, version, variant, placeholder))
 
-    if not tags:
-        return None
 
-    versions = []
-    for tag in tags:
-        if not tag.startswith(f"{variant}-"):
-            continue
-        version = tag[len(f"{variant}-") :]
-        if VERSION_PATTERN.match(version):
-            versions.append(version)
+async def mirror_images_batch_async(
+    source: str,
+    dest: str,
+    versions: list[str],
+    variant: str,
+    placeholder: str,
+    max_workers: int = MIRROR_WORKERS,
+) -> list[str]:
+    """Mirror versions concurrently, at most ``max_workers`` at a time.
+
+    Entries that are not version strings are reported as failed without
+    affecting the rest of the batch. The copies run concurrently, so each
+    major.minor and major floating tag is pushed only by the newest version
+    of the batch in that line; otherwise whichever copy finished last would
+    own it.
+    """
+    # Walk the versions oldest first so the newest one ends up owning each tag.
+    newest: dict[str, str] = {}
+    for version in sort_versions(set(filter(VERSION_PATTERN.fullmatch, versions))):
+        for alias in floating_versions(version):
+            newest[alias] = version
+
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def mirror_one(version: str) -> bool:
+        if not VERSION_PATTERN.fullmatch(version):
+            print(f"Error: unsupported version format: {version}", file=sys.stderr)
+            return False
+        async with semaphore:
+            return await mirror_image_async(
+                source,
+                dest,
+                version,
+                variant,
+                placeholder,
+                [
+                    alias
+                    for alias in floating_versions(version)
+                    if newest[alias] == version
+                ],
+            )
+
+    results = await asyncio.gather(*(mirror_one(version) for version in versions))
+    return [version for version, ok in zip(versions, results) if not ok]
 
+
+def mirror_images_batch(
+    source: str,
+    dest: str,
+    versions: list[str],
+    variant: str,
+    placeholder: str,
+    max_workers: int = MIRROR_WORKERS,
+) -> list[str]:
+    """Mirror several versions of one variant concurrently in this process.
+
+    This avoids starting a separate Python process per version when a whole
+    discovery result is mirrored at once. The buildx copies mostly wait on
+    registry I/O, so they are run as overlapping asyncio subprocesses.
+
+    Returns:
+        Versions that failed to mirror, in input order.
+
+    Raises:
+        ValueError: If ``max_workers`` is less than 1.
+    """
     if not versions:
-        return None
+        return []
+    return asyncio.run(
+        mirror_images_batch_async(
+            source, dest, versions, variant, placeholder, max_workers
+        )
+    )
+
+
+def latest_variant_version(tags: Iterable[str], variant: str) -> str | None:
+    """Return the newest version among "<variant>-<version>" tags, if any."""
+    # Single pass over the tags with one regex match per tag; no intermediate
+    # list or full sort.
+    pattern = variant_version_pattern(variant)
+    versions = (
+        match.group("version") for match in map(pattern.fullmatch, tags) if match
+    )
+    return max(versions, key=version_sort_key, default=None)
+
+
+def update_variant_latest_tags(
+    image: str, variant: str, tags: set[str], token: str
+) -> None:
+    """Point a variant's floating tags at its newest version in GHCR.
 
-    return sorted(versions, key=version_sort_key)[-1]
+    The newest version is picked from ``tags``, the image's GHCR tag set. Its
+    manifest is fetched once and uploaded unchanged under the floating tags,
+    so no blobs are copied.
+    """
+    latest = latest_variant_version(tags, variant)
+    if not latest:
+        print(f"No versions found for {variant}")
+        return
+
+    print(f"Updating {variant}-latest to point to {variant}-{latest}")
+    try:
+        manifest, media_type = get_ghcr_manifest(image, f"{variant}-{latest}", token)
+        for tag in (f"{variant}-latest", variant):
+            put_ghcr_manifest(image, tag, manifest, media_type, token)
+    except (URLError, HTTPError) as exc:
+        print(f"Warning: Could not update {variant}-latest: {exc}")
 
 
 def update_latest_tags(image: str, token: str) -> None:
-    """Update floating latest tags for all variants."""
-    dest = f"ghcr.io/{image}"
-
-    for variant in ["official", "full", "cep"]:
-        latest = find_latest_ghcr_tag(image, variant, token)
-        if latest:
-            print(f"Updating {variant}-latest to point to {variant}-{latest}")
-            result = subprocess.run(
-                [
-                    "docker",
-                    "buildx",
-                    "imagetools",
-                    "create",
-                    "-t",
-                    f"{dest}:{variant}-latest",
-                    "-t",
-                    f"{dest}:{variant}",
-                    f"{dest}:{variant}-{latest}",
-                ],
-                capture_output=True,
-                text=True,
+    """Update floating latest tags for all variants.
+
+    The GHCR tag list is fetched once and shared by all variants, which are
+    then updated concurrently. A listing from earlier in the same process is
+    only reused if nothing was pushed since.
+    """
+    token = get_ghcr_registry_token(image, token, "pull,push")
+    tags = fetch_ghcr_tag_set(image, token)
+    if tags is None:
+        print("Warning: Could not list GHCR tags")
+        tags = set()
+
+    with ThreadPoolExecutor(max_workers=len(VARIANTS)) as executor:
+        list(
+            executor.map(
+                lambda variant: update_variant_latest_tags(image, variant, tags, token),
+                VARIANTS,
             )
-            if result.returncode != 0:
-                print(f"Warning: Could not update {variant}-latest: {result.stderr}")
-        else:
-            print(f"No versions found for {variant}")
+        )
 
     print("Latest tags updated successfully!")
 
@@ -322,24 +1130,54 @@ def get_latest_upstream_version(
     return tags[-1] if tags else None
 
 
+def positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def cmd_discover(args: argparse.Namespace) -> None:
     """Handle discover subcommand."""
-    versions = discover_versions(
-        variant_filter=args.variant,
-        force_full_sync=args.force_full_sync,
-        image=args.image,
-    )
+    try:
+        versions = discover_versions(
+            variant_filter=args.variant,
+            force_full_sync=args.force_full_sync,
+            image=args.image,
+            token=os.environ.get("GH_TOKEN", ""),
+            cache_file=args.cache_file,
+            prefetch_pages=args.parallel_page_fetch,
+            stop_at_mirrored=args.stop_at_mirrored,
+        )
+    except (URLError, HTTPError) as exc:
+        # Probing treats auth and rate-limit failures as fatal rather than as
+        # missing tags; report them without a traceback.
+        sys.exit(f"Error: could not check GHCR tags: {exc}")
 
     if args.output_format == "json":
         print(json.dumps(versions))
     else:  # github format
+        # Serialize each list once and reuse it for the output file and stdout.
+        serialized = {
+            variant: json.dumps(ver_list) for variant, ver_list in versions.items()
+        }
         github_output = os.environ.get("GITHUB_OUTPUT", "")
         if github_output:
+            # GITHUB_OUTPUT is shared with other steps, so it must be appended
+            # to; all variants are written with a single call.
+            payload = "".join(
+                f"{variant}_versions={ver_json}\n"
+                for variant, ver_json in serialized.items()
+            )
             with open(github_output, "a") as f:
-                for variant, ver_list in versions.items():
-                    f.write(f"{variant}_versions={json.dumps(ver_list)}\n")
-        for variant, ver_list in versions.items():
-            print(f"{variant.capitalize()}: {json.dumps(ver_list)}")
+                f.write(payload)
+        if not args.quiet:
+            for variant, ver_json in serialized.items():
+                print(f"{variant.capitalize()}: {ver_json}")
 
 
 def cmd_mirror(args: argparse.Namespace) -> None:
@@ -355,6 +1193,35 @@ def cmd_mirror(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def cmd_mirror_batch(args: argparse.Namespace) -> None:
+    """Handle mirror-batch subcommand."""
+    try:
+        versions = json.loads(args.versions)
+    except json.JSONDecodeError as exc:
+        sys.exit(f"Invalid --versions JSON: {exc}")
+    if not isinstance(versions, list) or not all(
+        isinstance(version, str) for version in versions
+    ):
+        sys.exit("--versions must be a JSON list of version strings")
+    invalid = [
+        version for version in versions if not VERSION_PATTERN.fullmatch(version)
+    ]
+    if invalid:
+        sys.exit(f"Unsupported version format in --versions: {', '.join(invalid)}")
+
+    failed = mirror_images_batch(
+        source=args.source,
+        dest=args.dest,
+        versions=versions,
+        variant=args.variant,
+        placeholder=args.placeholder,
+        max_workers=args.workers,
+    )
+    if failed:
+        print(f"Failed to mirror: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
 def cmd_update_latest(args: argparse.Namespace) -> None:
     """Handle update-latest subcommand."""
     token = os.environ.get("GH_TOKEN", "")
@@ -379,14 +1246,33 @@ def main() -> None:
     discover_parser = subparsers.add_parser(
         "discover", help="Discover versions to mirror"
     )
-    discover_parser.add_argument(
-        "--variant", default="all", choices=["all", "official", "full", "cep"]
-    )
+    discover_parser.add_argument("--variant", default="all", choices=["all", *VARIANTS])
     discover_parser.add_argument("--force-full-sync", action="store_true")
     discover_parser.add_argument("--image", default="btreemap/overleaf")
     discover_parser.add_argument(
         "--output-format", default="json", choices=["json", "github"]
     )
+    discover_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Skip the human-readable summary for the github output format",
+    )
+    discover_parser.add_argument(
+        "--cache-file", help="JSON file caching versions already present in GHCR"
+    )
+    discover_parser.add_argument(
+        "--stop-at-mirrored",
+        action="store_true",
+        help="Stop Docker Hub pagination at each variant's newest mirrored "
+        "version; older gaps in the mirror are then not found",
+    )
+    discover_parser.add_argument(
+        "--parallel-page-fetch",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="Docker Hub pages to fetch concurrently with --stop-at-mirrored",
+    )
     discover_parser.set_defaults(func=cmd_discover)
 
     # mirror subcommand
@@ -404,6 +1290,35 @@ def main() -> None:
     )
     mirror_parser.set_defaults(func=cmd_mirror)
 
+    # mirror-batch subcommand
+    mirror_batch_parser = subparsers.add_parser(
+        "mirror-batch", help="Mirror several image versions in one process"
+    )
+    mirror_batch_parser.add_argument(
+        "--source", required=True, help="Source Docker Hub image"
+    )
+    mirror_batch_parser.add_argument(
+        "--dest", required=True, help="Destination GHCR image"
+    )
+    mirror_batch_parser.add_argument(
+        "--versions",
+        required=True,
+        help="JSON list of versions to mirror, as printed by discover",
+    )
+    mirror_batch_parser.add_argument(
+        "--variant", required=True, help="Tag variant prefix"
+    )
+    mirror_batch_parser.add_argument(
+        "--placeholder", required=True, help="Placeholder image for schema1"
+    )
+    mirror_batch_parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=MIRROR_WORKERS,
+        help="Number of versions mirrored concurrently",
+    )
+    mirror_batch_parser.set_defaults(func=cmd_mirror_batch)
+
     # update-latest subcommand
     update_latest_parser = subparsers.add_parser(
         "update-latest", help="Update floating latest tags"